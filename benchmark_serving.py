@@ -0,0 +1,230 @@
+import argparse
+import asyncio
+import os
+import resource
+import subprocess
+import sys
+import time
+
+# Configuration
+HOST = '127.0.0.1'
+THREADED_PORT = 8001
+ASYNC_PORT = 8002
+IDLE_CONNECTIONS = 2000  # Slow clients that connect and never finish their request
+REQUESTS = 500  # Active /results requests measured while the idle clients are held open
+CONCURRENCY = 50
+STARTUP_TIMEOUT = 15  # Seconds to wait for a server to accept connections
+LOAD_TIMEOUT = 120  # Seconds allowed for the whole batch of measured requests
+READ_TIMEOUT = 10  # Seconds allowed for a single response
+SETTLE_TIME = 1.0  # Seconds to let the server accept the idle connections before sampling
+SAMPLE_INTERVAL = 0.1  # Seconds between samples of the server's threads and memory
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SERVERS = {
+    "threaded": (
+        "import main1; main1.app.run(host='{host}', port={port}, threaded=True, debug=False)",
+        THREADED_PORT,
+    ),
+    "async": (
+        "import main1_async; main1_async.serve(host='{host}', port={port})",
+        ASYNC_PORT,
+    ),
+}
+
+def raise_open_file_limit(needed):
+    """
+    Raise the soft open-file limit so both this process and the server can hold the idle connections.
+    """
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    target = min(hard, max(soft, needed))
+    if target > soft:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+    return target
+
+def start_server(mode):
+    """
+    Start the server for the given mode in a subprocess (children inherit the raised file limit).
+    """
+    code, port = SERVERS[mode]
+    process = subprocess.Popen(
+        [sys.executable, "-c", code.format(host=HOST, port=port)],
+        cwd=BASE_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    return process, port
+
+async def wait_for_server(port):
+    """
+    Poll the port until the server accepts connections.
+    """
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        try:
+            _, writer = await asyncio.open_connection(HOST, port)
+            writer.close()
+            await writer.wait_closed()
+            return
+        except OSError:
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server on port {port} did not start within {STARTUP_TIMEOUT} seconds.")
+
+def read_process_status(pid):
+    """
+    Read the thread count and resident memory (in MB) of a process from /proc/<pid>/status.
+    """
+    threads, rss_mb = 0, 0.0
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("Threads:"):
+                threads = int(line.split()[1])
+            elif line.startswith("VmRSS:"):
+                rss_mb = int(line.split()[1]) / 1024
+    return threads, rss_mb
+
+async def sample_process(pid, peak):
+    """
+    Record the highest thread count and RSS seen until cancelled.
+    """
+    while True:
+        threads, rss_mb = read_process_status(pid)
+        peak["threads"] = max(peak["threads"], threads)
+        peak["rss_mb"] = max(peak["rss_mb"], rss_mb)
+        await asyncio.sleep(SAMPLE_INTERVAL)
+
+async def open_idle_connection(port):
+    """
+    Open a connection and send only part of a request, like a slow mobile client.
+    """
+    try:
+        _, writer = await asyncio.open_connection(HOST, port)
+        writer.write(f"GET /results HTTP/1.1\r\nHost: {HOST}\r\n".encode())
+        await writer.drain()
+        return writer
+    except OSError:
+        return None
+
+async def fetch_results(port):
+    """
+    Perform one complete GET /results request and return (latency in seconds, success flag).
+    """
+    start = time.perf_counter()
+    writer = None
+    try:
+        reader, writer = await asyncio.open_connection(HOST, port)
+        writer.write(f"GET /results HTTP/1.1\r\nHost: {HOST}\r\nConnection: close\r\n\r\n".encode())
+        await writer.drain()
+        response = await asyncio.wait_for(reader.read(), timeout=READ_TIMEOUT)
+        ok = response.startswith(b"HTTP/1.1 200 ") or response.startswith(b"HTTP/1.0 200 ")
+    except (OSError, asyncio.TimeoutError):
+        ok = False
+    finally:
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+    return time.perf_counter() - start, ok
+
+async def run_load(port, requests, concurrency):
+    """
+    Issue the active requests with a fixed number of concurrent clients.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited():
+        async with semaphore:
+            return await fetch_results(port)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(limited() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    return results, elapsed
+
+def percentile(values, fraction):
+    """
+    Return the value at the given fraction of the sorted list.
+    """
+    if not values:
+        return float('nan')
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(fraction * len(ordered)))
+    return ordered[index]
+
+async def benchmark_mode(mode, idle_connections, requests, concurrency, timeout):
+    """
+    Hold the idle connections open against one serving mode, then measure the server's
+    threads and memory and the latency of active requests.
+    """
+    process, port = start_server(mode)
+    held = []
+    row = {"mode": mode, "ok": 0, "failed": requests, "rps": 0.0,
+           "p50_ms": float('nan'), "p99_ms": float('nan')}
+    try:
+        await wait_for_server(port)
+
+        writers = await asyncio.gather(*(open_idle_connection(port) for _ in range(idle_connections)))
+        held = [w for w in writers if w is not None]
+        await asyncio.sleep(SETTLE_TIME)
+        row["idle_threads"], row["idle_rss_mb"] = read_process_status(process.pid)
+
+        peak = {"threads": row["idle_threads"], "rss_mb": row["idle_rss_mb"]}
+        sampler = asyncio.create_task(sample_process(process.pid, peak))
+        try:
+            results, elapsed = await asyncio.wait_for(run_load(port, requests, concurrency), timeout=timeout)
+        finally:
+            sampler.cancel()
+            row["peak_threads"], row["peak_rss_mb"] = peak["threads"], peak["rss_mb"]
+
+        latencies = [latency for latency, ok in results if ok]
+        row.update({
+            "ok": len(latencies),
+            "failed": len(results) - len(latencies),
+            "rps": len(latencies) / elapsed if elapsed else 0.0,
+            "p50_ms": percentile(latencies, 0.50) * 1000,
+            "p99_ms": percentile(latencies, 0.99) * 1000,
+        })
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        row["idle_held"] = len(held)
+        for writer in held:
+            writer.close()
+        process.terminate()
+        process.wait()
+    return row
+
+def print_report(rows):
+    """
+    Print the comparison table.
+    """
+    print(f"{'mode':<10}{'idle held':>11}{'threads':>9}{'RSS MB':>9}{'peak thr':>10}{'peak MB':>9}"
+          f"{'ok':>7}{'failed':>8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for row in rows:
+        print(f"{row['mode']:<10}{row['idle_held']:>11}"
+              f"{row.get('idle_threads', 0):>9}{row.get('idle_rss_mb', 0.0):>9.1f}"
+              f"{row.get('peak_threads', 0):>10}{row.get('peak_rss_mb', 0.0):>9.1f}"
+              f"{row['ok']:>7}{row['failed']:>8}{row['rps']:>10.1f}{row['p50_ms']:>10.1f}{row['p99_ms']:>10.1f}")
+
+async def main(args):
+    rows = []
+    for mode in args.modes:
+        rows.append(await benchmark_mode(mode, args.idle, args.requests, args.concurrency, args.timeout))
+    print_report(rows)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare threaded and async serving under many idle connections.")
+    parser.add_argument("--idle", type=int, default=IDLE_CONNECTIONS, help="number of idle client connections")
+    parser.add_argument("--requests", type=int, default=REQUESTS, help="number of measured /results requests")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY, help="concurrent active clients")
+    parser.add_argument("--timeout", type=float, default=LOAD_TIMEOUT,
+                        help="seconds allowed for the measured requests in each mode")
+    parser.add_argument("--modes", nargs="+", choices=list(SERVERS), default=list(SERVERS))
+    args = parser.parse_args()
+
+    limit = raise_open_file_limit(2 * args.idle + args.concurrency + 256)
+    if limit < args.idle + args.concurrency:
+        print(f"Warning: open-file limit is {limit}; some idle connections will be refused.")
+    asyncio.run(main(args))
@@ -304,123 +304,160 @@ def migrate_voters_table():
     conn.close()
     print("Migration completed successfully.")
 
-# Routes
-@app.route("/", methods=['GET', 'POST'])
-def otp_page():
-    """
-    Handle OTP generation and sending.
-    """
-    if request.method == "POST":
-        phone_number = request.form.get("phone_number")
-        if not phone_number:
-            flash("لطفاً شماره تلفن خود را وارد کنید.", "danger")
-            return render_template("otp.html")
-
-        # Check if phone number exists
-        voter = get_voter_by_phone_number(phone_number)
-        if not voter:
-            flash("شماره تلفن یافت نشد. لطفاً ابتدا ثبت‌نام کنید.", "danger")
-            return render_template("otp.html")
-
-        # Generate OTP and send it
-        otp = generate_otp(phone_number)
-        print(f"Generated OTP for {phone_number}: {otp}")  # Replace with actual SMS sending in production
-
-        session['phone_number'] = phone_number  # Store phone number in session for verification
-        flash("کد تایید به شماره تلفن شما ارسال شد.", "success")
-        return redirect(url_for("verify_otp_page"))
-
-    return render_template("otp.html")
-
-@app.route("/verify_otp", methods=["GET", "POST"])
-def verify_otp_page():
-    """
-    Handle OTP verification.
-    """
-    phone_number = session.get('phone_number')
-    if not phone_number:
-        flash("جلسه منقضی شده یا دسترسی نامعتبر. لطفاً دوباره تلاش کنید.", "danger")
-        return redirect(url_for("otp_page"))
-
-    if request.method == "POST":
-        entered_otp = request.form.get("otp")
-        if not entered_otp:
-            flash("لطفاً کد تایید را وارد کنید.", "danger")
-            return render_template("verify_otp.html", phone_number=phone_number)
-
-        if verify_otp_db(phone_number, entered_otp):
-            voter = get_voter_by_phone_number(phone_number)
-            session['voter_id'] = voter['id']
-            session.pop('phone_number', None)  # Remove phone_number from session
-            flash("شماره تلفن با موفقیت تایید شد!", "success")
-            return redirect(url_for("vote_page"))
-        else:
-            flash("کد تایید نامعتبر یا منقضی شده است. لطفاً دوباره تلاش کنید.", "danger")
-            return render_template("verify_otp.html", phone_number=phone_number)
-
-    return render_template("verify_otp.html", phone_number=phone_number)
-
-@app.route("/vote", methods=['GET', 'POST'])
-def vote_page():
-    """
-    Handle the voting process.
-    """
-    voter_id = session.get('voter_id')
-    if not voter_id:
-        flash("شما باید ابتدا شماره تلفن خود را تایید کنید.", "danger")
-        return redirect(url_for("otp_page"))
-
-    voters = get_voters()
-    voter = None
-    for v in voters:
-        if v['id'] == voter_id:
-            voter = v
-            break
-
-    if not voter:
-        flash("رای دهنده یافت نشد. لطفاً دوباره تلاش کنید.", "danger")
-        return redirect(url_for("otp_page"))
-
-    candidates = get_candidates()
-
-    if request.method == 'POST':
-        candidate_ids = request.form.getlist('candidate_ids')
-
-        if not candidate_ids:
-            flash("لطفاً حداقل یک نامزد را انتخاب کنید.", "danger")
-            return render_template('index.html', candidates=candidates)
-
-        if len(candidate_ids) > MAX_VOTES_PER_VOTER:
-            flash(f"شما حداکثر می‌توانید به {MAX_VOTES_PER_VOTER} نامزد رای دهید.", "danger")
-            return render_template('index.html', candidates=candidates)
-
-        current_vote_count = count_votes(voter_id)
-        if current_vote_count + len(candidate_ids) > MAX_VOTES_PER_VOTER:
-            allowed_votes = MAX_VOTES_PER_VOTER - current_vote_count
-            flash(f"شما می‌توانید فقط {allowed_votes} رای دیگر ثبت کنید.", "danger")
-            return render_template('index.html', candidates=candidates)
-
-        for candidate_id in candidate_ids:
-            cast_vote(voter_id, candidate_id)
-
-        # Retrieve voter's first and last name for the confirmation message
-        first_name = voter['first_name']
-        last_name = voter['last_name']
-
-        flash(f"آقای {first_name} {last_name}, رای شما با موفقیت ثبت شد.", "success")
-        return render_template("vote_confirmation.html", first_name=first_name, last_name=last_name)
-
-    return render_template('index.html', candidates=candidates)
-
-@app.route("/results")
-def results_page():
-    """
-    Display the election results.
-    """
-    vote_counts = get_vote_counts()
-    total_votes = get_total_votes()
-    return render_template('results.html', vote_counts=vote_counts, total_votes=total_votes)
-
+# Route Logic
+# Framework-independent steps shared by the routes here and in main1_async.py.
+# Each returns the outcome plus the (message, category) pair the route should flash.
+def process_otp_request(phone_number):
+    """
+    Validate the phone number, generate an OTP and send it.
+    Return (success, message, category).
+    """
+    if not phone_number:
+        return False, "لطفاً شماره تلفن خود را وارد کنید.", "danger"
+
+    # Check if phone number exists
+    voter = get_voter_by_phone_number(phone_number)
+    if not voter:
+        return False, "شماره تلفن یافت نشد. لطفاً ابتدا ثبت‌نام کنید.", "danger"
+
+    # Generate OTP and send it
+    otp = generate_otp(phone_number)
+    print(f"Generated OTP for {phone_number}: {otp}")  # Replace with actual SMS sending in production
+
+    return True, "کد تایید به شماره تلفن شما ارسال شد.", "success"
+
+def process_otp_verification(phone_number, entered_otp):
+    """
+    Verify the entered OTP for the phone number.
+    Return (voter_id, message, category); voter_id is None if verification failed.
+    """
+    if not entered_otp:
+        return None, "لطفاً کد تایید را وارد کنید.", "danger"
+
+    if verify_otp_db(phone_number, entered_otp):
+        voter = get_voter_by_phone_number(phone_number)
+        return voter['id'], "شماره تلفن با موفقیت تایید شد!", "success"
+
+    return None, "کد تایید نامعتبر یا منقضی شده است. لطفاً دوباره تلاش کنید.", "danger"
+
+def load_vote_page(voter_id):
+    """
+    Retrieve the voter and the candidate list for the voting page.
+    Return (voter, candidates); voter is None if no voter has this id.
+    """
+    voters = get_voters()
+    voter = None
+    for v in voters:
+        if v['id'] == voter_id:
+            voter = v
+            break
+
+    if not voter:
+        return None, []
+
+    return voter, get_candidates()
+
+def process_vote(voter, candidate_ids):
+    """
+    Check the selection against the voter's remaining votes and cast it.
+    Return (success, message, category).
+    """
+    if not candidate_ids:
+        return False, "لطفاً حداقل یک نامزد را انتخاب کنید.", "danger"
+
+    if len(candidate_ids) > MAX_VOTES_PER_VOTER:
+        return False, f"شما حداکثر می‌توانید به {MAX_VOTES_PER_VOTER} نامزد رای دهید.", "danger"
+
+    current_vote_count = count_votes(voter['id'])
+    if current_vote_count + len(candidate_ids) > MAX_VOTES_PER_VOTER:
+        allowed_votes = MAX_VOTES_PER_VOTER - current_vote_count
+        return False, f"شما می‌توانید فقط {allowed_votes} رای دیگر ثبت کنید.", "danger"
+
+    for candidate_id in candidate_ids:
+        cast_vote(voter['id'], candidate_id)
+
+    return True, f"آقای {voter['first_name']} {voter['last_name']}, رای شما با موفقیت ثبت شد.", "success"
+
+def get_results():
+    """
+    Retrieve the per-candidate vote counts and the total number of votes.
+    """
+    return get_vote_counts(), get_total_votes()
+
+# Routes
+# Mirrored in main1_async.py; keep both in sync (checked by parity_check.py).
+@app.route("/", methods=['GET', 'POST'])
+def otp_page():
+    """
+    Handle OTP generation and sending.
+    """
+    if request.method == "POST":
+        phone_number = request.form.get("phone_number")
+        success, message, category = process_otp_request(phone_number)
+        flash(message, category)
+        if not success:
+            return render_template("otp.html")
+
+        session['phone_number'] = phone_number  # Store phone number in session for verification
+        return redirect(url_for("verify_otp_page"))
+
+    return render_template("otp.html")
+
+@app.route("/verify_otp", methods=["GET", "POST"])
+def verify_otp_page():
+    """
+    Handle OTP verification.
+    """
+    phone_number = session.get('phone_number')
+    if not phone_number:
+        flash("جلسه منقضی شده یا دسترسی نامعتبر. لطفاً دوباره تلاش کنید.", "danger")
+        return redirect(url_for("otp_page"))
+
+    if request.method == "POST":
+        voter_id, message, category = process_otp_verification(phone_number, request.form.get("otp"))
+        flash(message, category)
+        if voter_id is None:
+            return render_template("verify_otp.html", phone_number=phone_number)
+
+        session['voter_id'] = voter_id
+        session.pop('phone_number', None)  # Remove phone_number from session
+        return redirect(url_for("vote_page"))
+
+    return render_template("verify_otp.html", phone_number=phone_number)
+
+@app.route("/vote", methods=['GET', 'POST'])
+def vote_page():
+    """
+    Handle the voting process.
+    """
+    voter_id = session.get('voter_id')
+    if not voter_id:
+        flash("شما باید ابتدا شماره تلفن خود را تایید کنید.", "danger")
+        return redirect(url_for("otp_page"))
+
+    voter, candidates = load_vote_page(voter_id)
+    if not voter:
+        flash("رای دهنده یافت نشد. لطفاً دوباره تلاش کنید.", "danger")
+        return redirect(url_for("otp_page"))
+
+    if request.method == 'POST':
+        success, message, category = process_vote(voter, request.form.getlist('candidate_ids'))
+        flash(message, category)
+        if not success:
+            return render_template('index.html', candidates=candidates)
+
+        return render_template("vote_confirmation.html", first_name=voter['first_name'], last_name=voter['last_name'])
+
+    return render_template('index.html', candidates=candidates)
+
+@app.route("/results")
+def results_page():
+    """
+    Display the election results.
+    """
+    vote_counts, total_votes = get_results()
+    return render_template('results.html', vote_counts=vote_counts, total_votes=total_votes)
+
 @app.route("/logout")
 def logout():
     """
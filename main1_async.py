@@ -0,0 +1,152 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from quart import Quart, current_app, render_template, request, redirect, url_for, session, flash
+
+from main1 import (
+    SECRET_KEY,
+    process_otp_request,
+    process_otp_verification,
+    load_vote_page,
+    process_vote,
+    get_results,
+)
+
+# Routes mirror those in main1.py; the route logic itself lives in main1.py and
+# parity_check.py runs both apps through the same flow to keep them in sync.
+
+# Configuration
+DB_EXECUTOR_WORKERS = 8  # Upper bound on concurrent SQLite calls
+HOST = '0.0.0.0'
+PORT = 8000
+KEEP_ALIVE_TIMEOUT = 75  # Seconds an idle client connection is held open
+
+app = Quart(__name__)
+app.config['SECRET_KEY'] = SECRET_KEY
+
+# Database Executor
+@app.before_serving
+async def start_db_executor():
+    """
+    Create the bounded executor for the blocking sqlite3 calls in main1.py.
+    """
+    app.db_executor = ThreadPoolExecutor(max_workers=DB_EXECUTOR_WORKERS, thread_name_prefix="db")
+
+@app.after_serving
+async def shutdown_db_executor():
+    """
+    Release the database worker threads when the server stops.
+    """
+    executor = app.db_executor
+    del app.db_executor
+    await asyncio.get_running_loop().run_in_executor(None, executor.shutdown)
+
+async def run_db(func, *args):
+    """
+    Run a blocking database function on the app's executor without blocking the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(current_app.db_executor, functools.partial(func, *args))
+
+# Routes
+@app.route("/", methods=['GET', 'POST'])
+async def otp_page():
+    """
+    Handle OTP generation and sending.
+    """
+    if request.method == "POST":
+        form = await request.form
+        phone_number = form.get("phone_number")
+        success, message, category = await run_db(process_otp_request, phone_number)
+        await flash(message, category)
+        if not success:
+            return await render_template("otp.html")
+
+        session['phone_number'] = phone_number  # Store phone number in session for verification
+        return redirect(url_for("verify_otp_page"))
+
+    return await render_template("otp.html")
+
+@app.route("/verify_otp", methods=["GET", "POST"])
+async def verify_otp_page():
+    """
+    Handle OTP verification.
+    """
+    phone_number = session.get('phone_number')
+    if not phone_number:
+        await flash("جلسه منقضی شده یا دسترسی نامعتبر. لطفاً دوباره تلاش کنید.", "danger")
+        return redirect(url_for("otp_page"))
+
+    if request.method == "POST":
+        form = await request.form
+        voter_id, message, category = await run_db(process_otp_verification, phone_number, form.get("otp"))
+        await flash(message, category)
+        if voter_id is None:
+            return await render_template("verify_otp.html", phone_number=phone_number)
+
+        session['voter_id'] = voter_id
+        session.pop('phone_number', None)  # Remove phone_number from session
+        return redirect(url_for("vote_page"))
+
+    return await render_template("verify_otp.html", phone_number=phone_number)
+
+@app.route("/vote", methods=['GET', 'POST'])
+async def vote_page():
+    """
+    Handle the voting process.
+    """
+    voter_id = session.get('voter_id')
+    if not voter_id:
+        await flash("شما باید ابتدا شماره تلفن خود را تایید کنید.", "danger")
+        return redirect(url_for("otp_page"))
+
+    voter, candidates = await run_db(load_vote_page, voter_id)
+    if not voter:
+        await flash("رای دهنده یافت نشد. لطفاً دوباره تلاش کنید.", "danger")
+        return redirect(url_for("otp_page"))
+
+    if request.method == 'POST':
+        form = await request.form
+        success, message, category = await run_db(process_vote, voter, form.getlist('candidate_ids'))
+        await flash(message, category)
+        if not success:
+            return await render_template('index.html', candidates=candidates)
+
+        return await render_template("vote_confirmation.html", first_name=voter['first_name'], last_name=voter['last_name'])
+
+    return await render_template('index.html', candidates=candidates)
+
+@app.route("/results")
+async def results_page():
+    """
+    Display the election results.
+    """
+    vote_counts, total_votes = await run_db(get_results)
+    return await render_template('results.html', vote_counts=vote_counts, total_votes=total_votes)
+
+# Linked from vote_confirmation.html, so the async app needs it too
+@app.route("/logout")
+async def logout():
+    """
+    Handle user logout by clearing the session.
+    """
+    session.clear()
+    await flash("شما از سیستم خارج شدید.", "info")
+    return redirect(url_for("otp_page"))
+
+def serve(host=HOST, port=PORT):
+    """
+    Serve the app on a single asyncio event loop with Hypercorn.
+    """
+    from hypercorn.asyncio import serve as hypercorn_serve
+    from hypercorn.config import Config
+
+    config = Config()
+    config.bind = [f"{host}:{port}"]
+    config.keep_alive_timeout = KEEP_ALIVE_TIMEOUT
+    config.backlog = 4096  # Let bursts of new connections queue instead of being refused
+    asyncio.run(hypercorn_serve(app, config))
+
+# Run the app
+if __name__ == "__main__":
+    serve()
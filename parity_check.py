@@ -0,0 +1,125 @@
+import asyncio
+import os
+import sys
+import tempfile
+from urllib.parse import urlencode
+
+from werkzeug.datastructures import MultiDict
+
+import main1
+import main1_async
+
+# Sample data for the flow
+PHONE_NUMBER = "09120000000"
+FIRST_NAME = "Ali"
+LAST_NAME = "Test"
+CANDIDATES = ["Candidate A", "Candidate B", "Candidate C"]
+
+def use_fresh_database(path):
+    """
+    Point main1 at a new database file and seed it with one voter and the sample candidates.
+    """
+    main1.DATABASE_URL = path
+    main1.create_tables()
+    main1.add_voter(PHONE_NUMBER, FIRST_NAME, LAST_NAME)
+    return [main1.add_candidate(name) for name in CANDIDATES]
+
+def read_otp(phone_number):
+    """
+    Read the OTP stored for the phone number, standing in for the SMS.
+    """
+    conn = main1.create_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT otp FROM otp_verification WHERE phone_number = ?", (phone_number,))
+    otp = cursor.fetchone()['otp']
+    conn.close()
+    return otp
+
+def flow_steps(candidate_ids):
+    """
+    The OTP -> verify -> vote -> results flow as (method, path, form) steps.
+    A form of None on the verify step means "use the OTP just generated".
+    Forms are MultiDicts so both test clients send repeated candidate_ids the same way.
+    """
+    return [
+        ("GET", "/", None),
+        ("POST", "/", MultiDict({"phone_number": ""})),
+        ("POST", "/", MultiDict({"phone_number": PHONE_NUMBER})),
+        ("GET", "/verify_otp", None),
+        ("POST", "/verify_otp", MultiDict({"otp": "000000"})),
+        ("POST", "/verify_otp", None),
+        ("GET", "/vote", None),
+        ("POST", "/vote", MultiDict([("candidate_ids", str(c)) for c in candidate_ids])),
+        ("POST", "/vote", MultiDict([("candidate_ids", str(candidate_ids[0]))])),
+        ("GET", "/results", None),
+        ("GET", "/logout", None),
+        ("GET", "/vote", None),
+    ]
+
+def run_flask(candidate_ids):
+    """
+    Run the flow against the threaded Flask app and record each response.
+    """
+    client = main1.app.test_client()
+    outcomes = []
+    for method, path, form in flow_steps(candidate_ids):
+        if path == "/verify_otp" and method == "POST" and form is None:
+            form = MultiDict({"otp": read_otp(PHONE_NUMBER)})
+        response = client.open(path, method=method, data=form)
+        outcomes.append((method, path, response.status_code, response.headers.get("Location"),
+                         response.get_data(as_text=True)))
+    return outcomes
+
+async def run_quart(candidate_ids):
+    """
+    Run the flow against the async Quart app and record each response.
+    """
+    # Serve once and stop first, as a restart would, so the executor is recreated for the flow
+    async with main1_async.app.test_app():
+        pass
+
+    outcomes = []
+    async with main1_async.app.test_app() as test_app:
+        client = test_app.test_client()
+        for method, path, form in flow_steps(candidate_ids):
+            if path == "/verify_otp" and method == "POST" and form is None:
+                form = MultiDict({"otp": read_otp(PHONE_NUMBER)})
+            if form is None:
+                response = await client.open(path, method=method)
+            else:
+                # Quart's form= argument keeps only the first value per key, so encode repeated keys here
+                response = await client.open(path, method=method, data=urlencode(list(form.items(multi=True))),
+                                             headers={"Content-Type": "application/x-www-form-urlencoded"})
+            outcomes.append((method, path, response.status_code, response.headers.get("Location"),
+                             await response.get_data(as_text=True)))
+    return outcomes
+
+def main():
+    original_database = main1.DATABASE_URL
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            candidate_ids = use_fresh_database(os.path.join(tmp, "flask.db"))
+            flask_outcomes = run_flask(candidate_ids)
+
+            candidate_ids = use_fresh_database(os.path.join(tmp, "quart.db"))
+            quart_outcomes = asyncio.run(run_quart(candidate_ids))
+        finally:
+            main1.DATABASE_URL = original_database
+
+    mismatches = 0
+    for flask_step, quart_step in zip(flask_outcomes, quart_outcomes):
+        method, path, flask_status, flask_location, flask_body = flask_step
+        _, _, quart_status, quart_location, quart_body = quart_step
+        same = (flask_status, flask_location, flask_body) == (quart_status, quart_location, quart_body)
+        print(f"{'ok' if same else 'MISMATCH':<9}{method:<5}{path:<12}flask={flask_status} async={quart_status}")
+        if not same:
+            mismatches += 1
+
+    if mismatches:
+        print(f"{mismatches} step(s) differ between main1.py and main1_async.py.")
+        return 1
+    print("main1.py and main1_async.py behave identically.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())